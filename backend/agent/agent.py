@@ -6,25 +6,53 @@ Model name, max iterations, and max tokens are loaded from config/defaults.yaml
 so they can be tuned without code changes.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
+import re
 import time
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
 import anthropic
 from dotenv import load_dotenv
 
-from .config_loader import load_agent_config
+from . import fast_json
+from .answer_cache import AnswerCache, answer_key
+from .config_loader import CACHE_DIR, load_agent_config
 from .mcp_client import MCPClientManager
-from .prompts import SYSTEM_PROMPT, CI_MODE_PROMPT
+from .prompts import ci_mode_prompt, system_prompt
 
-load_dotenv(Path(__file__).parent.parent / ".env")
+# Child processes inherit the loaded environment, so only the first one reads .env
+if not os.environ.get("_PERF_AGENT_DOTENV_LOADED"):
+    load_dotenv(Path(__file__).parent.parent / ".env")
+    os.environ["_PERF_AGENT_DOTENV_LOADED"] = "1"
 
 logger = logging.getLogger(__name__)
 
+# Prompt-cache breakpoint. Only static content (system prompt, tool schemas)
+# is marked — tool results change every iteration and are left uncached.
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+# Anthropic won't cache prefixes shorter than ~1024 tokens (~4 chars/token),
+# so the rolling conversation breakpoint only advances past this much new text.
+_MIN_CACHEABLE_CHARS = 4096
+
+# Regression verdict in CI mode. Word-bounded so e.g. "FAILSAFE" doesn't trip it.
+_FAIL_RE = re.compile(r"\bFAIL\b", re.IGNORECASE)
+
+# Identical (tool, args) calls within one run: nudge Claude at the first
+# repeat, stop the loop at the second — it's cycling, not making progress.
+# Only agent.read_only_tools are counted, and any other tool call resets the
+# counts: it may have changed what they return (e.g. save_baseline between
+# two compare_baseline calls), and live-state tools like get_http_metrics
+# are expected to be called with the same base_url before and after load.
+_REPEAT_NUDGE_AT = 2
+_REPEAT_STOP_AT = 3
+
 
 @dataclass
 class AgentResult:
@@ -44,6 +72,9 @@ class PerformanceAgent:
         max_iterations: int | None = None,
         ci_mode: bool = False,
         verbose: bool = False,
+        parallel_tools: bool = True,
+        use_cache: bool = True,
+        mcp: MCPClientManager | None = None,
     ):
         cfg = load_agent_config()
 
@@ -51,8 +82,23 @@ class PerformanceAgent:
         self.model = model or cfg.model
         self.max_iterations = max_iterations or cfg.max_iterations
         self.max_tokens = cfg.max_tokens
+        self.history_window = cfg.history_window
+        self._tool_sem = asyncio.Semaphore(cfg.tool_concurrency or 8)
+        self._answer_cache_tools = frozenset(cfg.answer_cache_tools)
+        self._read_only_tools = frozenset(cfg.read_only_tools)
+        # CI gates must always re-check, never replay an earlier verdict
+        self._answer_cache = (
+            AnswerCache(CACHE_DIR / "answers.sqlite", cfg.answer_cache_ttl_seconds)
+            if use_cache and not ci_mode and cfg.answer_cache_ttl_seconds > 0
+            else None
+        )
         self.ci_mode = ci_mode
         self.verbose = verbose
+        self.parallel_tools = parallel_tools
+
+        self._system = [{"type": "text", "text": system_prompt(), "cache_control": _CACHE_CONTROL}]
+        if ci_mode:
+            self._system.append({"type": "text", "text": ci_mode_prompt(), "cache_control": _CACHE_CONTROL})
 
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
@@ -62,31 +108,134 @@ class PerformanceAgent:
                 "  • To discover endpoints without a key: python -m agent discover <service>"
             )
 
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.mcp = MCPClientManager()
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+        # A caller-supplied client is already connected and outlives the agent
+        self._owns_mcp = mcp is None
+        self.mcp = mcp or MCPClientManager()
         self.conversation: list[dict[str, Any]] = []
         self.total_tool_calls = 0
+        self._initialized = False
+        self._tools: list[dict[str, Any]] = []
 
     async def initialize(self) -> list[dict[str, Any]]:
-        """Connect to all MCP servers and discover tools."""
-        tools = await self.mcp.connect_all()
+        """
+        Connect to all MCP servers and discover tools. Idempotent — later calls
+        reuse the open connections and the same tools list until close().
+        """
+        if self._initialized:
+            return self._tools
+        tools = await self.mcp.connect_all() if self._owns_mcp else self.mcp.get_claude_tools()
+        # Canonical key order keeps the serialized tools block byte-identical
+        # across runs, which prompt caching depends on.
+        self._tools = [_canonical(t) for t in tools]
+        self._initialized = True
         if self.verbose:
             print(self.mcp.get_tool_summary())
-        return tools
+        return self._tools
+
+    async def close(self) -> None:
+        """Disconnect from all MCP servers (unless the client was passed in). Call once when done."""
+        if self._owns_mcp:
+            await self.mcp.disconnect_all()
+        self._initialized = False
+        self._tools = []
+
+    async def __aenter__(self) -> "PerformanceAgent":
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _execute_tools(self, tool_calls: list[Any]) -> list[str | BaseException]:
+        """
+        Execute one turn's tool calls, concurrently unless parallel_tools is off.
+
+        Results are returned in tool_calls order. Exceptions are returned in
+        place of results so one failing call doesn't discard the others.
+        At most tool_concurrency calls are in flight at once.
+        """
+        if self.parallel_tools:
+            async def _call(c: Any) -> str:
+                async with self._tool_sem:
+                    return await self.mcp.call_tool(c.name, c.input)
+
+            return await asyncio.gather(
+                *(_call(c) for c in tool_calls),
+                return_exceptions=True,
+            )
+
+        results: list[str | BaseException] = []
+        for call in tool_calls:
+            try:
+                results.append(await self.mcp.call_tool(call.name, call.input))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    async def _create_message(
+        self,
+        system: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        conversation: list[dict[str, Any]],
+    ) -> Any:
+        """
+        Send one turn to Claude. In verbose mode the response is streamed so
+        text is echoed as it's generated instead of after the full decode.
+        """
+        kwargs = dict(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=system,
+            tools=tools,
+            messages=conversation,
+        )
+        if not self.verbose:
+            return await self.client.messages.create(**kwargs)
+
+        async with self.client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                print(text, end="", flush=True)
+            response = await stream.get_final_message()
+        print()
+        return response
 
     async def run(self, user_message: str) -> AgentResult:
-        """Run the agent with a user message. Implements the ReAct loop."""
+        """
+        Run the agent with a user message. Implements the ReAct loop.
+        MCP connections stay open for further runs — use the agent as an
+        async context manager, or call close() when done.
+        """
         start_time = time.time()
-
         await self.initialize()
+        return await self._run_one(
+            user_message, self.conversation, self._system, start_time
+        )
 
-        system = SYSTEM_PROMPT
-        if self.ci_mode:
-            system += "\n\n" + CI_MODE_PROMPT
+    async def run_batch(self, prompts: list[str]) -> list[AgentResult]:
+        """
+        Run several independent prompts concurrently through one agent.
 
-        self.conversation.append({"role": "user", "content": user_message})
+        MCP servers are connected once and the client, tools and system prompt
+        are shared; each prompt gets its own conversation. Tool calls across
+        all prompts share the tool_concurrency limit.
+        """
+        await self.initialize()
+        return await asyncio.gather(*(
+            self._run_one(p, [], self._system, time.time()) for p in prompts
+        ))
 
-        tools = self.mcp.get_claude_tools()
+    async def _run_one(
+        self,
+        user_message: str,
+        conversation: list[dict[str, Any]],
+        system: list[dict[str, Any]],
+        start_time: float,
+    ) -> AgentResult:
+        """ReAct loop for one prompt over an already-initialized MCP connection."""
+        prompt_idx = len(conversation)
+
+        tools = self._tools
         if not tools:
             return AgentResult(
                 response="No MCP tools available. Make sure MCP servers are built (npm run build).",
@@ -95,71 +244,218 @@ class PerformanceAgent:
                 duration_seconds=time.time() - start_time,
             )
 
+        # The key covers only this prompt, so a run that continues earlier turns
+        # (whose answer may depend on them) neither reads nor writes the cache
+        cache_key = None
+        if self._answer_cache and prompt_idx == 0:
+            system_text = "\n\n".join(block["text"] for block in system)
+            cache_key = answer_key(system_text, user_message, tools, self.model)
+            cached = self._answer_cache.get(cache_key)
+            if cached:
+                return AgentResult(**{
+                    **cached,
+                    "duration_seconds": round(time.time() - start_time, 2),
+                })
+
+        conversation.append({"role": "user", "content": user_message})
+        tools = _with_cache_breakpoint(tools)
+
         iterations = 0
+        tool_calls_made = 0
         final_response = ""
+        completed = False
+        stopped_repeating = False
+        cacheable = True
+        breakpoint_idx = -1
+        call_counts: Counter[tuple[str, str]] = Counter()
 
         while iterations < self.max_iterations:
             iterations += 1
             if self.verbose:
                 print(f"\n--- Agent Iteration {iterations} ---")
 
+            breakpoint_idx = _advance_cache_breakpoint(conversation, breakpoint_idx)
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    system=system,
-                    tools=tools,
-                    messages=self.conversation,
+                response = await self._create_message(
+                    system, tools, _with_message_breakpoint(conversation, breakpoint_idx)
                 )
             except anthropic.APIError as exc:
                 final_response = f"Claude API error: {exc}"
                 break
 
             assistant_content = response.content
-            self.conversation.append({"role": "assistant", "content": assistant_content})
+            conversation.append({"role": "assistant", "content": assistant_content})
 
-            tool_calls = [b for b in assistant_content if b.type == "tool_use"]
+            tool_calls = []
+            text_parts = []
+            for block in assistant_content:
+                if block.type == "tool_use":
+                    tool_calls.append(block)
+                elif block.type == "text":
+                    text_parts.append(block.text)
 
             if not tool_calls:
-                final_response = "\n".join(
-                    b.text for b in assistant_content if b.type == "text"
-                )
+                final_response = "\n".join(text_parts)
+                completed = True
                 break
 
-            tool_results = []
-            for call in tool_calls:
-                if self.verbose:
-                    print(f"  Tool: {call.name}({json.dumps(call.input, indent=2)[:200]})")
+            if response.stop_reason not in ("tool_use", "max_tokens"):
+                logger.warning("Unexpected stop_reason %r with tool calls", response.stop_reason)
 
-                result = await self.mcp.call_tool(call.name, call.input)
-                self.total_tool_calls += 1
+            if any(c.name not in self._answer_cache_tools for c in tool_calls):
+                cacheable = False
 
-                if self.verbose:
-                    preview = result[:300] + "..." if len(result) > 300 else result
-                    print(f"  Result: {preview}")
+            if self.verbose:
+                for call in tool_calls:
+                    print(f"  Tool: {call.name}({_preview(fast_json.dumps(call.input), 200)})")
 
+            results = await self._execute_tools(tool_calls)
+            tool_calls_made += len(tool_calls)
+            self.total_tool_calls += len(tool_calls)
+
+            if self.verbose:
+                for result in results:
+                    if not isinstance(result, BaseException):
+                        print(f"  Result: {_preview(result, 300)}")
+
+            tool_results = [_tool_result(c, r) for c, r in zip(tool_calls, results)]
+
+            repeats = []
+            if all(c.name in self._read_only_tools for c in tool_calls):
+                for call in tool_calls:
+                    sig = _call_signature(call)
+                    call_counts[sig] += 1
+                    if call_counts[sig] >= _REPEAT_NUDGE_AT:
+                        repeats.append((call.name, call_counts[sig]))
+            else:
+                # This turn may have changed state — earlier results may be stale
+                call_counts.clear()
+            if repeats:
+                names = ", ".join(sorted({name for name, _ in repeats}))
                 tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": call.id,
-                    "content": result,
+                    "type": "text",
+                    "text": (
+                        f"You already called {names} with these exact arguments. "
+                        "Use the earlier result from the conversation instead of calling it again."
+                    ),
                 })
 
-            self.conversation.append({"role": "user", "content": tool_results})
+            conversation.append({"role": "user", "content": tool_results})
 
-            if response.stop_reason == "end_turn":
-                final_response = "\n".join(
-                    b.text for b in assistant_content if b.type == "text"
-                )
+            if any(count >= _REPEAT_STOP_AT for _, count in repeats):
+                logger.warning("Stopping agent loop: repeated identical tool calls (%s)", names)
+                final_response = "\n".join([
+                    *text_parts,
+                    f"Stopped after repeated identical calls to {names} — the agent was not making progress.",
+                ])
+                stopped_repeating = True
                 break
 
-        has_regression = self.ci_mode and "FAIL" in final_response.upper()
+            if self.history_window:
+                dropped = _trim_history(conversation, prompt_idx + 1, self.history_window)
+                if dropped:
+                    # The earlier results are gone — don't nudge Claude to reuse them
+                    call_counts.clear()
+                if breakpoint_idx > prompt_idx + dropped:
+                    breakpoint_idx -= dropped
+                elif breakpoint_idx > prompt_idx:
+                    breakpoint_idx = -1  # breakpoint message was dropped
 
-        await self.mcp.disconnect_all()
+        # A run cut short can't vouch for the service — fail it in CI
+        has_regression = self.ci_mode and (stopped_repeating or bool(_FAIL_RE.search(final_response)))
 
-        return AgentResult(
+        result = AgentResult(
             response=final_response,
-            tool_calls_made=self.total_tool_calls,
+            tool_calls_made=tool_calls_made,
             iterations=iterations,
             duration_seconds=round(time.time() - start_time, 2),
             has_regression=has_regression,
         )
+        if cache_key and completed and cacheable:
+            self._answer_cache.put(cache_key, asdict(result))
+        return result
+
+
+def _tool_result(call: Any, result: str | BaseException) -> dict[str, Any]:
+    """tool_result block for one call; exceptions are reported to Claude as is_error."""
+    if isinstance(result, BaseException):
+        return {"type": "tool_result", "tool_use_id": call.id, "is_error": True, "content": str(result)}
+    return {"type": "tool_result", "tool_use_id": call.id, "content": result}
+
+
+def _preview(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _call_signature(call: Any) -> tuple[str, str]:
+    """(tool name, short hash of canonical args) — identifies a repeated call."""
+    args = fast_json.dumps(call.input, sort_keys=True).encode()
+    return call.name, hashlib.blake2b(args, digest_size=8).hexdigest()
+
+
+def _trim_history(conversation: list[dict[str, Any]], start: int, window: int) -> int:
+    """
+    Drop the oldest assistant/tool-result turn pairs after conversation[start - 1]
+    (the run's prompt) once the run's history exceeds `window` messages.
+    Returns the number of messages removed.
+
+    Trims back to half the window so the cached prefix survives several
+    iterations between trims instead of being invalidated on every one.
+    """
+    history = len(conversation) - start
+    if history <= window:
+        return 0
+    keep = max(window // 2, 2)
+    drop = history - keep
+    drop -= drop % 2  # whole assistant + tool_result pairs only
+    del conversation[start:start + drop]
+    return drop
+
+
+def _advance_cache_breakpoint(conversation: list[dict[str, Any]], last_idx: int) -> int:
+    """
+    Pick the message that carries the single rolling conversation breakpoint:
+    the newest user turn, once enough new history has built up since the last
+    one to be worth a cache write. Returns its index (-1 if none yet).
+    """
+    idx = len(conversation) - 1
+    if idx <= last_idx or conversation[idx]["role"] != "user":
+        return last_idx
+
+    new_chars = sum(len(str(m["content"])) for m in conversation[last_idx + 1:])
+    if new_chars < _MIN_CACHEABLE_CHARS:
+        return last_idx
+    return idx
+
+
+def _with_message_breakpoint(conversation: list[dict[str, Any]], idx: int) -> list[dict[str, Any]]:
+    """
+    Messages to send, with a cache breakpoint on conversation[idx].
+
+    Only the marked message is copied — conversation itself is never mutated,
+    so an existing history can be safely shared as a prefix (e.g. across runs)
+    and never accumulates stale breakpoints. Tools + system use up to 3 of
+    Anthropic's 4 breakpoints, leaving exactly one for the conversation.
+    """
+    if idx < 0:
+        return conversation
+    message = conversation[idx]
+    content = message["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    marked = {**message, "content": [*content[:-1], {**content[-1], "cache_control": _CACHE_CONTROL}]}
+    return [*conversation[:idx], marked, *conversation[idx + 1:]]
+
+
+def _canonical(value: Any) -> Any:
+    """Recursively sort dict keys so equal tool schemas serialize identically."""
+    if isinstance(value, dict):
+        return {k: _canonical(value[k]) for k in sorted(value)}
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def _with_cache_breakpoint(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Copy of tools with a cache breakpoint on the last entry (caches the whole block)."""
+    return [*tools[:-1], {**tools[-1], "cache_control": _CACHE_CONTROL}]
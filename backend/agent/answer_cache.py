@@ -0,0 +1,81 @@
+"""
+Answer cache — persists final agent answers so identical runs skip the ReAct loop.
+
+Provides:
+  - answer_key()   — stable key over (system prompt, user message, tools, model)
+  - AnswerCache    — SQLite-backed key → JSON store with a TTL
+
+Only runs whose every tool call is on an allowlist of config-only tools
+are written (agent.answer_cache_tools in config/defaults.yaml), and never
+in CI mode — a replayed verdict would be stale the moment results, files
+or the service change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def answer_key(system: str, user_message: str, tools: list[dict[str, Any]], model: str) -> str:
+    """Hash everything that determines the agent's answer."""
+    h = hashlib.blake2b(digest_size=20)
+    for part in (system, user_message, json.dumps(tools, sort_keys=True), model):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class AnswerCache:
+    """Tiny SQLite key/value store with per-entry expiry."""
+
+    def __init__(self, path: Path, ttl_seconds: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached value, or None if missing/expired/unreadable."""
+        try:
+            row = self._db().execute(
+                "SELECT value, created FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("Answer cache read failed: %s", exc)
+            return None
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        """Store a value. Failures are logged and ignored — the cache is best-effort."""
+        try:
+            with self._db() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO answers (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time()),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Answer cache write failed: %s", exc)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -3,16 +3,15 @@ Agentic mode command — natural language instruction dispatched to Claude.
 Requires ANTHROPIC_API_KEY.
 """
 
-import asyncio
 import os
 import sys
 
 import typer
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
 
-console = Console()
+from agent.console import console
+
+# Responses longer than this skip Markdown rendering and print as plain text
+_MARKDOWN_MAX_CHARS = 50_000
 
 
 def run(
@@ -21,6 +20,7 @@ def run(
     ci: bool = typer.Option(False, "--ci", help="CI/CD mode: concise output, exit code reflects pass/fail"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show each tool call and result"),
     max_iterations: int = typer.Option(None, "--max-iterations", help="Maximum agent loop iterations"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and don't write the cached answer for this prompt"),
 ):
     """[AGENTIC] Natural language instruction — requires ANTHROPIC_API_KEY."""
     if not os.environ.get("ANTHROPIC_API_KEY"):
@@ -29,9 +29,13 @@ def run(
         console.print("  [bold]python3 -m agent test --service <name> --users 3 --duration 30[/bold]")
         raise typer.Exit(1)
 
+    from agent import event_loop  # noqa: PLC0415
     from agent.agent import PerformanceAgent  # noqa: PLC0415
+    from agent.daemon import open_mcp  # noqa: PLC0415
 
     if not ci:
+        from rich.panel import Panel  # noqa: PLC0415
+
         console.print(Panel(
             f"[bold blue]Agentic Performance Testing Platform[/bold blue]\n"
             f"[dim]Model: {model or 'from config'} | Max iterations: {max_iterations or 'from config'}[/dim]",
@@ -40,21 +44,38 @@ def run(
         ))
         console.print(f"\n[bold]Task:[/bold] {message}\n")
 
-    agent = PerformanceAgent(
-        model=model,
-        max_iterations=max_iterations,
-        ci_mode=ci,
-        verbose=verbose,
-    )
+    async def _run():
+        agent = PerformanceAgent(
+            model=model,
+            max_iterations=max_iterations,
+            ci_mode=ci,
+            verbose=verbose,
+            use_cache=not no_cache,
+            mcp=await open_mcp(),
+        )
+        async with agent:
+            return await agent.run(message)
 
-    result = asyncio.run(agent.run(message))
+    result = event_loop.run(_run())
 
     if ci:
-        print(result.response)
-        sys.exit(1 if result.has_regression else 0)
+        sys.stdout.buffer.write((result.response + "\n").encode())
+        sys.stdout.buffer.flush()
+        event_loop.exit_now(1 if result.has_regression else 0)
+    elif not sys.stdout.isatty():
+        # Piped or redirected: just the response — no Markdown parse, no panel chrome
+        sys.stdout.write(result.response + "\n")
     else:
         console.print("\n")
-        console.print(Panel(Markdown(result.response), title="Agent Results", border_style="green"))
+        if len(result.response) > _MARKDOWN_MAX_CHARS:
+            # Too long to parse as Markdown up front — print it as-is
+            console.rule("Agent Results", style="green")
+            console.print(result.response, markup=False, highlight=False)
+        else:
+            from rich.markdown import Markdown  # noqa: PLC0415
+            from rich.panel import Panel  # noqa: PLC0415
+
+            console.print(Panel(Markdown(result.response), title="Agent Results", border_style="green"))
         console.print(
             f"\n[dim]Completed in {result.duration_seconds}s | "
             f"{result.tool_calls_made} tool calls | "
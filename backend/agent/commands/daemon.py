@@ -0,0 +1,40 @@
+"""
+Daemon commands: keep MCP servers warm between CLI invocations.
+None of these require an Anthropic API key.
+"""
+
+import typer
+
+from agent.console import console
+
+daemon_app = typer.Typer(help="Keep MCP servers running between commands", no_args_is_help=True)
+
+
+@daemon_app.command("start")
+def start():
+    """Start the MCP daemon in the foreground (Ctrl-C to stop)."""
+    from agent import event_loop  # noqa: PLC0415
+    from agent.daemon import SOCKET_PATH, serve  # noqa: PLC0415
+
+    console.print(f"[bold]Starting MCP daemon on[/bold] {SOCKET_PATH}")
+    try:
+        event_loop.run(serve())
+    except RuntimeError as exc:  # one is already running
+        console.print(f"[yellow]{exc}[/yellow]")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@daemon_app.command("stop")
+def stop():
+    """Stop a running MCP daemon."""
+    from agent import event_loop  # noqa: PLC0415
+    from agent.daemon import DaemonClient  # noqa: PLC0415
+
+    try:
+        event_loop.run(DaemonClient().shutdown())
+    except OSError:
+        console.print("[yellow]No MCP daemon running.[/yellow]")
+        return
+    console.print("[green]✓[/green] MCP daemon stopped")
@@ -2,15 +2,19 @@
 Deterministic mode command — fixed 6-step pipeline, no API key required.
 """
 
-import asyncio
 import sys
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-console = Console()
+from agent.console import console
+
+_HEADER = (
+    "[bold blue]Deterministic Performance Test[/bold blue]\n"
+    "[dim]Service: {service} | Env: {env} | Users: {users} | "
+    "Duration: {duration}s | Verbose: {verbose}[/dim]"
+)
+
+_RESULT_COLUMNS = (("Metric", "bold"), ("Value", "cyan"))
 
 
 def test(
@@ -28,8 +32,9 @@ def test(
     Parameters can be provided as flags or environment variables:
       PERF_SERVICE, PERF_ENV, PERF_USERS, PERF_DURATION, PERF_BASELINE
     """
+    from agent import event_loop  # noqa: PLC0415
     from agent.config_loader import load_test_run_config  # noqa: PLC0415
-    from agent.mcp_client import MCPClientManager  # noqa: PLC0415
+    from agent.daemon import open_mcp  # noqa: PLC0415
     from agent.pipeline import DeterministicPipeline  # noqa: PLC0415
     from agent.tool_caller import ToolCallError  # noqa: PLC0415
 
@@ -43,28 +48,28 @@ def test(
         raise typer.Exit(1)
 
     if not ci:
+        from rich.panel import Panel  # noqa: PLC0415
+
         console.print(Panel(
-            f"[bold blue]Deterministic Performance Test[/bold blue]\n"
-            f"[dim]Service: {run_config.service} | Env: {run_config.env} | "
-            f"Users: {run_config.users or 'from config'} | "
-            f"Duration: {run_config.duration or 'from config'}s | "
-            f"Verbose: {verbose}[/dim]",
+            _HEADER.format(
+                service=run_config.service,
+                env=run_config.env,
+                users=run_config.users or "from config",
+                duration=run_config.duration or "from config",
+                verbose=verbose,
+            ),
             title="Test Starting",
             border_style="blue",
         ))
 
     async def _run():
-        mcp = MCPClientManager()
-        await mcp.connect_all()
+        mcp = await open_mcp()
         if verbose:
             console.print(f"\n[dim]{mcp.get_tool_summary()}[/dim]")
-        try:
-            return await DeterministicPipeline(mcp, run_config).run()
-        finally:
-            await mcp.disconnect_all()
+        return await DeterministicPipeline(mcp, run_config).run()
 
     try:
-        result = asyncio.run(_run())
+        result = event_loop.run(_run())
     except (ToolCallError, ValueError) as exc:
         console.print(f"[red]Pipeline failed:[/red] {exc}")
         raise typer.Exit(1)
@@ -74,8 +79,7 @@ def test(
 
 def _render_results(result, run_config, ci: bool) -> None:
     """Render pipeline results as CI one-liner or rich table."""
-    from agent.pipeline import PipelineResult  # noqa: PLC0415
-    assert isinstance(result, PipelineResult)
+    from agent import event_loop  # noqa: PLC0415
 
     analysis = result.analysis
     verdict = result.verdict
@@ -83,31 +87,33 @@ def _render_results(result, run_config, ci: bool) -> None:
     dur = stats.get("http_req_duration", {})
 
     if ci:
-        print(f"VERDICT: {'FAIL' if verdict != 'PASS' else 'PASS'}")
+        # One pre-encoded write straight to the byte stream, then flush before exiting
+        lines = [f"VERDICT: {'FAIL' if verdict != 'PASS' else 'PASS'}"]
         if result.comparison and result.comparison.get("regressions"):
-            print(f"REGRESSIONS: {', '.join(result.comparison['regressions'])}")
-        print(f"GRADE: {analysis.get('performance_grade', '?')}")
-        print(
+            lines.append(f"REGRESSIONS: {', '.join(result.comparison['regressions'])}")
+        lines.append(f"GRADE: {analysis.get('performance_grade', '?')}")
+        lines.append(
             f"p95: {dur.get('p95_ms')}ms | "
             f"p99: {dur.get('p99_ms')}ms | "
             f"errors: {stats.get('error_rate_percent')}%"
         )
-        sys.exit(1 if verdict != "PASS" else 0)
-
-    table = Table(title=f"Results — {run_config.service} ({run_config.env})", show_lines=True)
-    table.add_column("Metric", style="bold")
-    table.add_column("Value", style="cyan")
-    table.add_row("Grade",          analysis.get("performance_grade", "?"))
-    table.add_row("p50 latency",    f"{dur.get('p50_ms')}ms")
-    table.add_row("p95 latency",    f"{dur.get('p95_ms')}ms")
-    table.add_row("p99 latency",    f"{dur.get('p99_ms')}ms")
-    table.add_row("Error rate",     f"{stats.get('error_rate_percent')}%")
-    table.add_row("Throughput",     f"{stats.get('requests_per_second')} req/s")
-    table.add_row("Total requests", str(stats.get("total_requests")))
-    table.add_row(
-        "Verdict",
-        "[green]PASS[/green]" if verdict == "PASS" else "[red]FAIL — regression detected[/red]",
+        sys.stdout.buffer.write(("\n".join(lines) + "\n").encode())
+        sys.stdout.buffer.flush()
+        event_loop.exit_now(1 if verdict != "PASS" else 0)
+
+    table = _new_results_table(f"Results — {run_config.service} ({run_config.env})")
+    rows = (
+        ("Grade",          analysis.get("performance_grade", "?")),
+        ("p50 latency",    f"{dur.get('p50_ms')}ms"),
+        ("p95 latency",    f"{dur.get('p95_ms')}ms"),
+        ("p99 latency",    f"{dur.get('p99_ms')}ms"),
+        ("Error rate",     f"{stats.get('error_rate_percent')}%"),
+        ("Throughput",     f"{stats.get('requests_per_second')} req/s"),
+        ("Total requests", str(stats.get("total_requests"))),
+        ("Verdict",        "[green]PASS[/green]" if verdict == "PASS" else "[red]FAIL — regression detected[/red]"),
     )
+    for row in rows:
+        table.add_row(*row)
 
     console.print("\n")
     console.print(table)
@@ -120,3 +126,13 @@ def _render_results(result, run_config, ci: bool) -> None:
 
     if result.report.get("saved_to"):
         console.print(f"\n[dim]Report saved: {result.report['saved_to']}[/dim]")
+
+
+def _new_results_table(title: str):
+    """Empty Metric/Value table — columns come from _RESULT_COLUMNS."""
+    from rich.table import Table  # noqa: PLC0415
+
+    table = Table(title=title, show_lines=True)
+    for name, style in _RESULT_COLUMNS:
+        table.add_column(name, style=style)
+    return table
@@ -3,35 +3,53 @@ Utility commands: discover, list-tools, check.
 None of these require an Anthropic API key.
 """
 
-import asyncio
+import hashlib
 import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-console = Console()
+from agent.console import CONSOLE_OPTIONS, console
+
+# `check` is skipped while this holds a recent success time (see check --export)
+_SERVERS_OK_VAR = "PERF_AGENT_SERVERS_OK"
+_SERVERS_OK_TTL_SECONDS = 300
+
+_ENDPOINT_COLUMNS = (
+    ("Method", {"style": "bold green", "width": 8}),
+    ("Path", {"style": "cyan"}),
+    ("Summary", {}),
+)
 
 
 def discover(
     service: str = typer.Argument(..., help="Service name (as defined in config/services.yaml)"),
     env: str = typer.Option("local", "--env", "-e", help="Environment: local | dev | staging"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Query the service even if a recent result is cached"),
 ):
     """Discover endpoints for a service. Does NOT require an Anthropic API key."""
-    from agent.mcp_client import MCPClientManager  # noqa: PLC0415
+    from agent import event_loop, fast_json  # noqa: PLC0415
+    from agent.config_loader import CACHE_DIR, load_agent_config  # noqa: PLC0415
+    from agent.daemon import open_mcp  # noqa: PLC0415
 
     async def _discover() -> str:
-        mcp = MCPClientManager()
-        await mcp.connect_all()
-        result = await mcp.call_tool("discover_endpoints", {"service_name": service, "environment": env})
-        await mcp.disconnect_all()
-        return result
-
-    raw = asyncio.run(_discover())
+        mcp = await open_mcp()
+        return await mcp.call_tool("discover_endpoints", {"service_name": service, "environment": env})
+
+    ttl = load_agent_config().discover_cache_ttl_seconds
+    # Hashed so a service/env name can never point outside the cache dir
+    cache_id = hashlib.blake2b(f"{service}\0{env}".encode(), digest_size=12).hexdigest()
+    cache_file = CACHE_DIR / f"discover-{cache_id}.json"
+    raw = None if no_cache or ttl <= 0 else _read_discover_cache(cache_file, ttl)
+    cached = raw is not None
+    if raw is None:
+        raw = event_loop.run(_discover())
 
     try:
-        data = json.loads(raw)
+        data = fast_json.loads(raw)
     except json.JSONDecodeError:
         console.print(raw)
         return
@@ -40,6 +58,10 @@ def discover(
         console.print(f"[red]Error:[/red] {data['error']}")
         raise typer.Exit(1)
 
+    if not cached and ttl > 0:
+        _write_discover_cache(cache_file, data)
+
+    test_data_file, auth_config = data.get("test_data_file"), data.get("auth_config")
     lines = [
         f"[bold]Service:[/bold] {data.get('service')}",
         f"[bold]Environment:[/bold] {data.get('environment')}",
@@ -51,15 +73,17 @@ def discover(
             f"{data['after_filtering']} after filters "
             f"({data['filtered_out']} skipped)[/dim]"
         )
-    if data.get("test_data_file"):
-        lines.append(f"[dim]Test data: {data['test_data_file']}[/dim]")
-    if data.get("auth_config"):
-        lines.append(f"[dim]Auth: {data['auth_config']['url']}[/dim]")
+    if test_data_file:
+        lines.append(f"[dim]Test data: {test_data_file}[/dim]")
+    if auth_config:
+        lines.append(f"[dim]Auth: {auth_config['url']}[/dim]")
     lines.append(
         f"[dim]Safety caps: {data.get('max_concurrent_users')} max users, "
         f"{data.get('max_duration_seconds')}s max duration[/dim]"
     )
 
+    from rich.panel import Panel  # noqa: PLC0415
+
     console.print(Panel("\n".join(lines), title="Service Discovery", border_style="cyan"))
 
     endpoints = data.get("endpoints", [])
@@ -67,50 +91,131 @@ def discover(
         console.print("[yellow]No testable endpoints found after filtering.[/yellow]")
         return
 
+    from rich.table import Table  # noqa: PLC0415
+
     table = Table(title=f"{len(endpoints)} Testable Endpoint(s)", show_lines=True)
-    table.add_column("Method", style="bold green", width=8)
-    table.add_column("Path", style="cyan")
-    table.add_column("Summary")
-    for ep in endpoints:
-        table.add_row(ep["method"], ep["path"], ep.get("summary", ""))
+    for name, opts in _ENDPOINT_COLUMNS:
+        table.add_column(name, **opts)
+    rows = [(ep["method"], ep["path"], ep.get("summary", "")) for ep in endpoints]
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
 
+def _read_discover_cache(path: Path, ttl_seconds: int) -> Optional[str]:
+    """Cached discover_endpoints response, or None if missing, expired, or older than services.yaml."""
+    from agent.config_loader import PROJECT_ROOT  # noqa: PLC0415
+
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    if time.time() - mtime > ttl_seconds:
+        return None
+    services_yaml = PROJECT_ROOT / "config" / "services.yaml"
+    if services_yaml.exists() and services_yaml.stat().st_mtime > mtime:
+        return None
+    return path.read_text(encoding="utf-8")
+
+
+# auth_config fields that are safe to keep on disk — credentials are dropped
+_CACHED_AUTH_FIELDS = ("url", "token_field")
+
+
+def _write_discover_cache(path: Path, data: dict) -> None:
+    """
+    Cache a discover response without its credentials. Written 0600 to a
+    temp file and renamed, so concurrent runs never see half a file.
+    """
+    from agent import fast_json  # noqa: PLC0415
+
+    auth = data.get("auth_config")
+    if auth:
+        data = {**data, "auth_config": {k: auth[k] for k in _CACHED_AUTH_FIELDS if k in auth}}
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Entries from before hashed names were cached with credentials in them
+        for legacy in path.parent.glob("discover-*-*.json"):
+            legacy.unlink(missing_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(fast_json.dumps(data))
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)  # best-effort — the next run just queries again
+
+
 def list_tools():
     """List all available MCP tools from connected servers."""
-    from agent.mcp_client import MCPClientManager  # noqa: PLC0415
+    from agent import event_loop  # noqa: PLC0415
+    from agent.daemon import open_mcp  # noqa: PLC0415
+    from rich.panel import Panel  # noqa: PLC0415
 
     async def _list():
-        mcp = MCPClientManager()
-        tools = await mcp.connect_all()
+        mcp = await open_mcp()
+        tools = mcp.get_claude_tools()
         console.print(Panel(mcp.get_tool_summary(), title="Available MCP Tools", border_style="cyan"))
         console.print("\n[bold]Tool Details:[/bold]\n")
-        for tool in tools:
-            console.print(f"  [bold cyan]{tool['name']}[/bold cyan]")
-            console.print(f"    {tool['description'][:120]}")
-            console.print()
-        await mcp.disconnect_all()
+        # One print for all tools — a console write per line adds up for large registries
+        names = [t["name"] for t in tools]
+        descs = [t["description"][:120] for t in tools]
+        console.print("\n".join(
+            f"  [bold cyan]{name}[/bold cyan]\n    {desc}\n" for name, desc in zip(names, descs)
+        ))
+
+    event_loop.run(_list())
 
-    asyncio.run(_list())
 
+def check(
+    export: bool = typer.Option(
+        False, "--export",
+        help=f"On success print only 'export {_SERVERS_OK_VAR}=<time>' — for eval in CI scripts",
+    ),
+):
+    """Verify MCP servers are built and can connect.
 
-def check():
-    """Verify MCP servers are built and can connect."""
-    from agent.mcp_client import MCPClientManager  # noqa: PLC0415
+    Skipped when $PERF_AGENT_SERVERS_OK holds a check time from the last 5 minutes.
+    """
+    from agent import event_loop  # noqa: PLC0415
+    from agent.daemon import open_mcp  # noqa: PLC0415
 
-    async def _check():
-        mcp = MCPClientManager()
-        console.print("[bold]Checking MCP server connections...[/bold]\n")
-        tools = await mcp.connect_all()
+    try:
+        checked_at = int(os.environ.get(_SERVERS_OK_VAR, ""))
+    except ValueError:
+        checked_at = 0
+    # A timestamp in the future (clock skew, hand-set value) never counts
+    if 0 <= time.time() - checked_at < _SERVERS_OK_TTL_SECONDS:
+        if export:
+            print(f"export {_SERVERS_OK_VAR}={checked_at}")
+        else:
+            console.print(f"[green]✓[/green] MCP servers verified recently (${_SERVERS_OK_VAR}) — skipping")
+        return
+
+    if export:
+        from rich.console import Console  # noqa: PLC0415
+        out = Console(stderr=True, **CONSOLE_OPTIONS)
+    else:
+        out = console
+
+    async def _check() -> bool:
+        out.print("[bold]Checking MCP server connections...[/bold]\n")
+        mcp = await open_mcp()
+        await mcp.start_pending()  # actually spawn lazily registered servers
+        tools = mcp.get_claude_tools()
         for name, server in mcp.connected_servers.items():
-            console.print(f"  [green]✓[/green] {name}: {len(server.tools)} tools")
+            out.print(f"  [green]✓[/green] {name}: {len(server.tools)} tools")
         if not mcp.connected_servers:
-            console.print("  [red]✗[/red] No servers connected. Run 'npm run build' first.")
-        else:
-            console.print(
-                f"\n[green]All {len(mcp.connected_servers)} servers connected, "
-                f"{len(tools)} total tools available.[/green]"
-            )
-        await mcp.disconnect_all()
+            out.print("  [red]✗[/red] No servers connected. Run 'npm run build' first.")
+            return False
+        out.print(
+            f"\n[green]All {len(mcp.connected_servers)} servers connected, "
+            f"{len(tools)} total tools available.[/green]"
+        )
+        return True
 
-    asyncio.run(_check())
+    ok = event_loop.run(_check())
+    if export:
+        if not ok:
+            raise typer.Exit(1)
+        print(f"export {_SERVERS_OK_VAR}={int(time.time())}")
@@ -10,6 +10,7 @@ Priority order (highest wins):
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -19,30 +20,48 @@ import yaml
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DEFAULTS_PATH = PROJECT_ROOT / "config" / "defaults.yaml"
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "perf-agent"
 
-_defaults_cache: dict | None = None
+# libyaml-backed loader when available — several times faster than pure Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _defaults_mtime() -> Optional[int]:
+    """Cache key for defaults.yaml — changes whenever the file is edited."""
+    try:
+        return DEFAULTS_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
 
 
 def _load_raw_defaults() -> dict:
     """Load and cache config/defaults.yaml. Returns empty dict if file not found."""
-    global _defaults_cache
-    if _defaults_cache is None:
-        if DEFAULTS_PATH.exists():
-            with open(DEFAULTS_PATH) as f:
-                _defaults_cache = yaml.safe_load(f) or {}
-        else:
-            _defaults_cache = {}
-    return _defaults_cache
+    return _parse_defaults(_defaults_mtime())
 
 
-@dataclass
+@functools.lru_cache(maxsize=1)
+def _parse_defaults(mtime_ns: Optional[int]) -> dict:
+    if mtime_ns is None:
+        return {}
+    return yaml.load(DEFAULTS_PATH.read_bytes(), Loader=_YAML_LOADER) or {}
+
+
+@dataclass(frozen=True)
 class AgentConfig:
     model: str
     max_iterations: int
     max_tokens: int
+    tool_concurrency: int
+    history_window: int
+    answer_cache_ttl_seconds: int
+    discover_cache_ttl_seconds: int
+    answer_cache_tools: tuple[str, ...]
+    tool_result_ttl_seconds: int
+    read_only_tools: tuple[str, ...]
+    snapshot_timeout_seconds: float
 
 
-@dataclass
+@dataclass(frozen=True)
 class TestRunConfig:
     service: str
     env: str
@@ -55,12 +74,28 @@ class TestRunConfig:
 
 
 def load_agent_config() -> AgentConfig:
-    """Load agent settings from defaults.yaml with in-code fallbacks."""
-    a = _load_raw_defaults().get("agent", {})
+    """
+    Load agent settings from defaults.yaml with in-code fallbacks.
+    The same (frozen) instance is returned until defaults.yaml changes.
+    """
+    return _build_agent_config(_defaults_mtime())
+
+
+@functools.lru_cache(maxsize=1)
+def _build_agent_config(mtime_ns: Optional[int]) -> AgentConfig:
+    a = _parse_defaults(mtime_ns).get("agent", {})
     return AgentConfig(
         model=a.get("model", "claude-sonnet-4-6"),
         max_iterations=a.get("max_iterations", 30),
         max_tokens=a.get("max_tokens", 8192),
+        tool_concurrency=a.get("tool_concurrency", 8),
+        history_window=a.get("history_window", 0),
+        answer_cache_ttl_seconds=a.get("answer_cache_ttl_seconds", 3600),
+        discover_cache_ttl_seconds=a.get("discover_cache_ttl_seconds", 300),
+        answer_cache_tools=tuple(a.get("answer_cache_tools") or ("list_services", "get_service_config")),
+        tool_result_ttl_seconds=a.get("tool_result_ttl_seconds", 60),
+        read_only_tools=tuple(a.get("read_only_tools") or ()),
+        snapshot_timeout_seconds=a.get("snapshot_timeout_seconds", 30),
     )
 
 
@@ -68,19 +103,40 @@ def load_test_run_config(overrides: dict) -> TestRunConfig:
     """
     Build a TestRunConfig by merging CLI flags → env vars → defaults.
     CLI flags (values in `overrides`) always win over environment variables.
+    Identical overrides return the same (frozen) instance.
     """
+    return _build_test_run_config(frozenset(overrides.items()))
+
+
+@functools.lru_cache(maxsize=32)
+def _build_test_run_config(items: frozenset) -> TestRunConfig:
+    overrides = dict(items)
+    env = _perf_env()
     return TestRunConfig(
-        service=overrides.get("service") or os.environ.get("PERF_SERVICE", ""),
-        env=overrides.get("env") or os.environ.get("PERF_ENV", "local"),
-        users=overrides.get("users") or _int_or_none(os.environ.get("PERF_USERS")),
-        duration=overrides.get("duration") or _int_or_none(os.environ.get("PERF_DURATION")),
-        baseline=overrides.get("baseline") or os.environ.get("PERF_BASELINE"),
+        service=overrides.get("service") or env["service"],
+        env=overrides.get("env") or env["env"],
+        users=overrides.get("users") or env["users"],
+        duration=overrides.get("duration") or env["duration"],
+        baseline=overrides.get("baseline") or env["baseline"],
         save_as=overrides.get("save_as"),
         ci=overrides.get("ci", False),
         verbose=overrides.get("verbose", False),
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _perf_env() -> dict:
+    """PERF_* variables, read and type-checked once per process."""
+    environ = os.environ
+    return {
+        "service": environ.get("PERF_SERVICE", ""),
+        "env": environ.get("PERF_ENV", "local"),
+        "users": _int_or_none(environ.get("PERF_USERS")),
+        "duration": _int_or_none(environ.get("PERF_DURATION")),
+        "baseline": environ.get("PERF_BASELINE"),
+    }
+
+
 def _int_or_none(value: Optional[str]) -> Optional[int]:
     try:
         return int(value) if value else None
@@ -0,0 +1,44 @@
+"""
+Shared Rich console, created on first use.
+
+Provides:
+  - console        — proxy for the process-wide rich Console
+  - get_console()  — the Console itself
+  - CONSOLE_OPTIONS — keyword arguments for any other Console (e.g. stderr)
+
+rich is imported, and the terminal probed, only when something is actually
+printed — CI runs write plain text and never pay for either.
+
+Styling here is always explicit markup, so the automatic repr highlighter
+and :emoji: substitution are switched off — both are regex passes over
+every printed string, and tool-result previews are long.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+CONSOLE_OPTIONS = {"highlight": False, "emoji": False}
+
+
+@functools.lru_cache(maxsize=1)
+def get_console() -> "Console":
+    from rich.console import Console  # noqa: PLC0415
+    return Console(**CONSOLE_OPTIONS)
+
+
+class _LazyConsole:
+    """Forwards attribute access (print, rule, …) to get_console()."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_console(), name)
+
+
+console = _LazyConsole()
@@ -0,0 +1,333 @@
+"""
+MCP daemon — keeps MCP server connections warm across CLI invocations.
+
+    python3 -m agent daemon start     # runs in the foreground; Ctrl-C to stop
+    python3 -m agent daemon stop
+
+CLI commands call open_mcp(), which talks to the daemon over a Unix socket
+when one is running and falls back to an in-process MCPClientManager when
+it isn't (or when its config no longer matches this checkout).
+
+Wire format: 4-byte big-endian length + JSON body, one request/response
+pair at a time per connection.
+  request:  {"op": "hello" | "servers" | "call_tool" | "call_tools" | "shutdown", ...}
+            ("hello" returns the config key and the tool catalog together;
+             "call_tools" runs a list of calls concurrently, results in order)
+  response: {"ok": true, "result": ...} | {"ok": false, "error": "..."}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import stat
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from . import event_loop, fast_json
+from .config_loader import CACHE_DIR, PROJECT_ROOT
+from .mcp_client import MCPClientManager, _catalog_key, _load_server_configs
+
+logger = logging.getLogger(__name__)
+
+# Per-user location: $XDG_RUNTIME_DIR (0700, per login) or the user's cache dir —
+# never a shared directory where another user could bind the path first
+SOCKET_PATH = (
+    Path(os.environ["XDG_RUNTIME_DIR"]) / "perf-agent.sock"
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else CACHE_DIR / "daemon.sock"
+)
+
+# Files whose contents determine what the daemon's MCP servers would serve
+_CONFIG_FILES = ("config/services.yaml", "config/mcp-servers.yaml", "config/defaults.yaml")
+
+_HEADER = struct.Struct(">I")
+
+
+def config_key() -> str:
+    """
+    Hash of the config files and each server's built JS — a daemon started
+    on different config, or before an `npm run build`, is stale.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for rel in _CONFIG_FILES:
+        path = PROJECT_ROOT / rel
+        h.update(rel.encode())
+        h.update(path.read_bytes() if path.exists() else b"")
+    for server in _load_server_configs():
+        h.update(f"{server.name}:{_catalog_key(server)}".encode())
+    return h.hexdigest()
+
+
+def _owned_socket(path: Path) -> bool:
+    """True if path is a socket owned by this user — only then is whoever answers on it trusted."""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+async def _send(writer: asyncio.StreamWriter, payload: dict) -> None:
+    body = fast_json.dumps(payload).encode()
+    writer.write(_HEADER.pack(len(body)) + body)
+    await writer.drain()
+
+
+async def _recv(reader: asyncio.StreamReader) -> dict:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return fast_json.loads(await reader.readexactly(size))
+
+
+# ── Server ────────────────────────────────────────────────────────────────────
+
+
+async def serve(socket_path: Optional[Path] = None) -> None:
+    """
+    Connect all MCP servers and serve tool calls until shut down.
+
+    Raises RuntimeError if a daemon is already answering on socket_path —
+    replacing its socket would orphan it and its MCP server subprocesses.
+    """
+    socket_path = socket_path or SOCKET_PATH
+    if await _daemon_answers(socket_path):
+        raise RuntimeError(f"An MCP daemon is already running on {socket_path}")
+    # No call memo: requests come from separate CLI invocations, and one
+    # of them may be `discover --no-cache` expecting a fresh answer.
+    mcp = MCPClientManager(memoize=False)
+    await mcp.connect_all()
+    key = config_key()
+    stop = asyncio.Event()
+
+    def _catalog() -> dict[str, list[dict[str, Any]]]:
+        return {name: server.tools for name, server in mcp.connected_servers.items()}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _recv(reader)
+                op = request.get("op")
+                if op == "hello":
+                    # Carries the tool catalog so a client connects in one round trip
+                    result: Any = {"config_key": key, "servers": _catalog()}
+                elif op == "servers":
+                    result = _catalog()
+                elif op == "call_tool":
+                    result = await mcp.call_tool(request["name"], request.get("args") or {})
+                elif op == "call_tools":
+                    result = await asyncio.gather(*(
+                        mcp.call_tool(c["name"], c.get("args") or {}) for c in request["calls"]
+                    ))
+                elif op == "shutdown":
+                    await _send(writer, {"ok": True, "result": None})
+                    stop.set()
+                    return
+                else:
+                    await _send(writer, {"ok": False, "error": f"Unknown op: {op}"})
+                    continue
+                await _send(writer, {"ok": True, "result": result})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # client closed the connection
+        finally:
+            writer.close()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    socket_path.unlink(missing_ok=True)
+    # Created 0600 from the start — chmod after bind would leave a window
+    old_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handle, path=str(socket_path))
+    finally:
+        os.umask(old_umask)
+    logger.info("MCP daemon listening on %s", socket_path)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        socket_path.unlink(missing_ok=True)
+        await mcp.disconnect_all()
+
+
+async def _daemon_answers(socket_path: Path) -> bool:
+    if not _owned_socket(socket_path):
+        return False
+    try:
+        await DaemonClient(socket_path)._request({"op": "hello"})
+    except (OSError, RuntimeError, asyncio.IncompleteReadError):
+        return False
+    return True
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _RemoteServer:
+    """Stands in for ConnectedServer — commands only read .tools."""
+    tools: list[dict[str, Any]]
+
+
+class DaemonClient:
+    """
+    MCPClientManager look-alike that forwards calls to a running daemon.
+
+    Tool calls issued in the same event-loop iteration (e.g. the arms of a
+    gather) are coalesced into one "call_tools" request, which the daemon
+    runs concurrently. Each request opens its own socket connection, so
+    calls issued later don't serialize behind an in-flight batch.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        self.socket_path = socket_path or SOCKET_PATH
+        self.connected_servers: dict[str, _RemoteServer] = {}
+        self._claude_tools: list[dict[str, Any]] = []
+        self._batch: list[tuple[str, dict[str, Any], asyncio.Future[str]]] = []
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def _request(self, payload: dict) -> Any:
+        reader, writer = await asyncio.open_unix_connection(str(self.socket_path))
+        try:
+            await _send(writer, payload)
+            response = await _recv(reader)
+        finally:
+            writer.close()
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "daemon error"))
+        return response["result"]
+
+    async def connect_all(self) -> list[dict[str, Any]]:
+        self._load_catalog(await self._request({"op": "servers"}))
+        return self._claude_tools
+
+    def _load_catalog(self, servers: dict[str, list[dict[str, Any]]]) -> None:
+        self.connected_servers = {name: _RemoteServer(tools) for name, tools in servers.items()}
+        # Same (server, tool) order as MCPClientManager.connect_all, so both
+        # paths send a byte-identical tools block (prompt cache, answer cache)
+        self._claude_tools = [
+            t for _, _, t in sorted(
+                ((name, t["name"], t) for name, tools in servers.items() for t in tools),
+                key=lambda entry: entry[:2],
+            )
+        ]
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        self._batch.append((tool_name, arguments, future))
+        if len(self._batch) == 1:
+            # Runs after every task already scheduled this iteration has queued its call
+            loop.call_soon(self._flush_batch)
+        return await future
+
+    def _flush_batch(self) -> None:
+        batch, self._batch = self._batch, []
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(self, batch: list[tuple[str, dict[str, Any], asyncio.Future[str]]]) -> None:
+        """Send one batch and resolve its futures. Every future is settled, whatever goes wrong."""
+        outcome: BaseException = RuntimeError("MCP daemon returned fewer results than calls")
+        try:
+            if len(batch) == 1:
+                name, args, _ = batch[0]
+                results = [await self._call_one(name, args)]
+            else:
+                calls = [{"name": name, "args": args} for name, args, _ in batch]
+                try:
+                    results = await self._request({"op": "call_tools", "calls": calls})
+                except (OSError, RuntimeError, asyncio.IncompleteReadError) as exc:
+                    results = [fast_json.dumps({"error": f"Tool call failed: {exc}"})] * len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():  # the caller may have been cancelled
+                    future.set_result(result)
+        except asyncio.CancelledError as exc:
+            outcome = exc
+            raise
+        except Exception as exc:  # e.g. a malformed frame — delivered to the callers instead
+            outcome = exc
+        finally:
+            for _, _, future in batch:
+                if not future.done():
+                    if isinstance(outcome, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(outcome)
+
+    async def _call_one(self, tool_name: str, arguments: dict[str, Any]) -> str:
+        try:
+            return await self._request({"op": "call_tool", "name": tool_name, "args": arguments})
+        except (OSError, RuntimeError, asyncio.IncompleteReadError) as exc:
+            return fast_json.dumps({"error": f"Tool call failed: {exc}"})
+
+    def get_claude_tools(self) -> list[dict[str, Any]]:
+        return self._claude_tools
+
+    def get_tool_summary(self) -> str:
+        lines = ["Connected MCP Servers (via daemon):"]
+        for name, server in self.connected_servers.items():
+            lines.append(f"  {name}: {', '.join(t['name'] for t in server.tools)}")
+        lines.append(f"\nTotal: {len(self._claude_tools)} tools available")
+        return "\n".join(lines)
+
+    async def start_pending(self) -> None:
+        """Nothing to start — the daemon connects every server eagerly."""
+
+    async def disconnect_all(self) -> None:
+        """Nothing to tear down — the daemon keeps its MCP servers running."""
+
+    async def shutdown(self) -> None:
+        if not _owned_socket(self.socket_path):
+            raise FileNotFoundError(f"No MCP daemon socket owned by this user at {self.socket_path}")
+        await self._request({"op": "shutdown"})
+
+
+_shared: Optional[Union[MCPClientManager, DaemonClient]] = None
+
+
+async def open_mcp() -> Union[MCPClientManager, DaemonClient]:
+    """
+    Connected MCP client for CLI commands: the daemon if one is running with
+    matching config, otherwise an in-process MCPClientManager. In-process
+    servers with a cached tool list start lazily, on their first tool call.
+
+    The client is shared for the life of the process — commands must not
+    disconnect it; that happens once when the shared event loop closes.
+    """
+    global _shared
+    if _shared is None:
+        client = await _try_daemon()
+        if client is None:
+            client = MCPClientManager()
+            await client.connect_all(lazy=True)
+        _shared = client
+        event_loop.on_close(close_mcp)
+    return _shared
+
+
+async def close_mcp() -> None:
+    """Disconnect the shared client, if one was opened."""
+    global _shared
+    if _shared is not None:
+        client, _shared = _shared, None
+        await client.disconnect_all()
+
+
+async def _try_daemon() -> Optional[DaemonClient]:
+    if not _owned_socket(SOCKET_PATH):
+        return None
+    client = DaemonClient()
+    try:
+        hello = await client._request({"op": "hello"})
+        if hello.get("config_key") != config_key():
+            logger.info("MCP daemon config is stale — connecting in-process")
+            return None
+        client._load_catalog(hello["servers"])
+    except (OSError, RuntimeError, KeyError, asyncio.IncompleteReadError) as exc:
+        logger.debug("MCP daemon unavailable: %s", exc)
+        return None
+    return client
@@ -0,0 +1,98 @@
+"""
+Process-wide event loop for CLI commands.
+
+Provides:
+  - get_loop()  — the shared loop, created on first use (uvloop when installed)
+  - run()       — asyncio.run() replacement that reuses the shared loop
+  - on_close()  — register an async cleanup to run before the loop closes
+  - exit_now()  — bounded cleanup, close the loop, and os._exit() (CI fast path)
+
+asyncio.run() builds and tears down a loop (and its default executor) per
+call; commands that are composed in one process — or call several
+coroutines in sequence — share one loop instead. The loop is closed at
+interpreter exit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextlib
+import logging
+import os
+import sys
+from typing import Any, Awaitable, Callable, Coroutine, NoReturn, Optional, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # optional: pip install .[speedups]
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_CLEANUPS: list[Callable[[], Awaitable[Any]]] = []
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed():
+        # libuv-based loop: cheaper scheduling for this all-I/O workload
+        _LOOP = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        asyncio.set_event_loop(_LOOP)
+    return _LOOP
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro to completion on the shared loop. Cancels it if interrupted (e.g. Ctrl-C)."""
+    loop = get_loop()
+    task = loop.create_task(coro)
+    try:
+        return loop.run_until_complete(task)
+    except BaseException:
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(BaseException):
+                loop.run_until_complete(task)
+        raise
+
+
+def on_close(cleanup: Callable[[], Awaitable[Any]]) -> None:
+    """Await cleanup() on the shared loop at exit, before the loop is closed."""
+    _CLEANUPS.append(cleanup)
+
+
+# exit_now() gives cleanups this long before cancelling them
+_FAST_EXIT_GRACE_SECONDS = 0.1
+
+
+@atexit.register
+def _close_loop(grace_seconds: Optional[float] = None) -> None:
+    if _LOOP is None or _LOOP.is_closed():
+        return
+    try:
+        while _CLEANUPS:
+            try:
+                _LOOP.run_until_complete(asyncio.wait_for(_CLEANUPS.pop()(), grace_seconds))
+            except Exception as exc:
+                logger.debug("Cleanup failed at exit: %s", exc)
+        _LOOP.run_until_complete(_LOOP.shutdown_asyncgens())
+        _LOOP.run_until_complete(_LOOP.shutdown_default_executor())
+    finally:
+        _LOOP.close()
+
+
+def exit_now(code: int) -> NoReturn:
+    """
+    Exit without interpreter teardown — the CI fast path. Cleanups get a short
+    grace period and are then cancelled, which tears the MCP stdio sessions
+    down (terminating the server subprocesses) instead of waiting on a
+    graceful shutdown. Then stdio is flushed and the process ends with
+    os._exit, skipping atexit handlers and GC of leftover transports.
+    """
+    _close_loop(_FAST_EXIT_GRACE_SECONDS)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
@@ -0,0 +1,49 @@
+"""
+JSON helpers for MCP tool payloads — orjson when installed, stdlib otherwise.
+
+Provides:
+  - loads()   — parse str or bytes
+  - dumps()   — compact str, optionally key-sorted (stable for cache keys)
+  - pretty()  — 2-space indented str, for verbose logging
+
+orjson's decode errors subclass json.JSONDecodeError, so callers keep
+catching json.JSONDecodeError either way.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional: pip install .[speedups]
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+
+    _SORTED_OPTS = orjson.OPT_SORT_KEYS
+    _PRETTY_OPTS = orjson.OPT_INDENT_2
+
+    def dumps(obj: Any, sort_keys: bool = False) -> str:
+        return orjson.dumps(obj, option=_SORTED_OPTS if sort_keys else 0).decode()
+
+    def pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=_PRETTY_OPTS).decode()
+
+else:
+    loads = json.loads
+
+    # json.dumps() builds a fresh JSONEncoder whenever it gets non-default
+    # options; these are built once and reused
+    _COMPACT = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    _COMPACT_SORTED = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    _PRETTY = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+    def dumps(obj: Any, sort_keys: bool = False) -> str:
+        return (_COMPACT_SORTED if sort_keys else _COMPACT).encode(obj)
+
+    def pretty(obj: Any) -> str:
+        return _PRETTY.encode(obj)
@@ -11,11 +11,13 @@ Utilities:
     python3 -m agent discover payment-service
     python3 -m agent check
     python3 -m agent list-tools
+    python3 -m agent daemon start      # keep MCP servers warm between commands
 """
 
 import typer
 
 from agent.commands.agentic import run
+from agent.commands.daemon import daemon_app
 from agent.commands.deterministic import test
 from agent.commands.utils import check, discover, list_tools
 
@@ -23,6 +25,9 @@ app = typer.Typer(
     name="perf-agent",
     help="Agentic AI Performance Testing Platform",
     no_args_is_help=True,
+    # Startup cost: no shell-completion options, no Rich traceback installer
+    add_completion=False,
+    pretty_exceptions_enable=False,
 )
 
 app.command()(run)
@@ -30,6 +35,7 @@ app.command()(test)
 app.command()(discover)
 app.command("list-tools")(list_tools)
 app.command()(check)
+app.add_typer(daemon_app, name="daemon")
 
 if __name__ == "__main__":
     app()
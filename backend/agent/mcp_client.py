@@ -3,10 +3,23 @@ MCP Client Manager — connects to MCP servers, discovers tools, routes calls.
 
 Server list is loaded from config/mcp-servers.yaml so adding or removing a
 server requires only a YAML edit — no Python code changes needed.
+
+Each server's tool list is cached on disk (~/.cache/perf-agent), keyed on
+its command line and build output, so warm starts skip list_tools().
+With connect_all(lazy=True), servers whose tool list is cached aren't
+started until a tool call is first routed to them.
+
+Servers are started concurrently. Each session lives in its own task so
+the stdio/session context managers are entered and exited by the same
+task, whichever task later calls disconnect_all().
 """
 
-import json
+import asyncio
+import functools
+import hashlib
 import logging
+import os
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
@@ -14,159 +27,330 @@ from typing import Any, Optional
 import yaml
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import TextContent
+
+from . import fast_json
+from .config_loader import CACHE_DIR, DEFAULTS_PATH, load_agent_config
 
 logger = logging.getLogger(__name__)
 
+_CALL_MEMO_MAX_ENTRIES = 256
+
+# In-flight calls allowed per server session unless mcp-servers.yaml sets `concurrency`
+_DEFAULT_SERVER_CONCURRENCY = 4
+
+# libyaml-backed loader when available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 MCP_SERVERS_CONFIG = PROJECT_ROOT / "config" / "mcp-servers.yaml"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPServerConfig:
-    """Configuration for a single MCP server subprocess."""
+    """Configuration for a single MCP server subprocess. Shared across managers, so frozen."""
     name: str
     command: str
-    args: list[str]
-    env: dict[str, str] = field(default_factory=dict)
+    args: tuple[str, ...]
+    env: dict[str, str] = field(default_factory=dict, hash=False)
+    concurrency: int = _DEFAULT_SERVER_CONCURRENCY
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectedServer:
-    """A live MCP server session with its discovered tools."""
+    """An MCP server's tools, and its session once started (None while lazily pending)."""
     config: MCPServerConfig
-    session: ClientSession
     tools: list[dict[str, Any]]
+    session: Optional[ClientSession] = None
+    # Caps in-flight calls on the one stdio session; other servers are unaffected
+    sem: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.sem = asyncio.Semaphore(max(1, self.config.concurrency))
 
 
 def _load_server_configs() -> list[MCPServerConfig]:
     """
     Load MCP server definitions from config/mcp-servers.yaml.
     Falls back to hardcoded defaults if the file is not found.
+    Parsed once per process, and again only when the file changes.
     """
-    if MCP_SERVERS_CONFIG.exists():
-        with open(MCP_SERVERS_CONFIG) as f:
-            data = yaml.safe_load(f) or {}
+    try:
+        mtime_ns: Optional[int] = MCP_SERVERS_CONFIG.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return list(_parse_server_configs(mtime_ns))
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_server_configs(mtime_ns: Optional[int]) -> tuple[MCPServerConfig, ...]:
+    if mtime_ns is not None:
+        data = yaml.load(MCP_SERVERS_CONFIG.read_bytes(), Loader=_YAML_LOADER) or {}
         servers = []
         for name, cfg in (data.get("servers") or {}).items():
             # Resolve relative args paths against PROJECT_ROOT
-            args = [
+            args = tuple(
                 str(PROJECT_ROOT / a) if not Path(a).is_absolute() else a
                 for a in (cfg.get("args") or [])
-            ]
+            )
             servers.append(MCPServerConfig(
                 name=name,
                 command=cfg.get("command", "node"),
                 args=args,
                 env=cfg.get("env") or {},
+                concurrency=int(cfg.get("concurrency", _DEFAULT_SERVER_CONCURRENCY)),
             ))
         if servers:
-            return servers
+            return tuple(servers)
         logger.warning("config/mcp-servers.yaml has no servers defined — using defaults")
 
     # In-code fallback (matches the YAML defaults exactly)
     logger.info("config/mcp-servers.yaml not found — using built-in server list")
     mcp_dir = PROJECT_ROOT / "backend" / "mcp-servers"
-    return [
+    return (
         MCPServerConfig(
             name="service-registry",
             command="node",
-            args=[str(mcp_dir / "service-registry" / "dist" / "index.js")],
+            args=(str(mcp_dir / "service-registry" / "dist" / "index.js"),),
         ),
         MCPServerConfig(
             name="perf-test",
             command="node",
-            args=[str(mcp_dir / "perf-test-server" / "dist" / "index.js")],
+            args=(str(mcp_dir / "perf-test-server" / "dist" / "index.js"),),
         ),
         MCPServerConfig(
             name="spring-metrics",
             command="node",
-            args=[str(mcp_dir / "spring-metrics" / "dist" / "index.js")],
+            args=(str(mcp_dir / "spring-metrics" / "dist" / "index.js"),),
         ),
         MCPServerConfig(
             name="results-analyzer",
             command="node",
-            args=[str(mcp_dir / "results-analyzer" / "dist" / "index.js")],
+            args=(str(mcp_dir / "results-analyzer" / "dist" / "index.js"),),
         ),
-    ]
+    )
+
+
+def _catalog_key(config: MCPServerConfig) -> Optional[str]:
+    """
+    Fingerprint of everything that shapes a server's tool list: its command
+    line and env, its built JS (dist/), and defaults.yaml (some tool
+    descriptions quote its caps). None if the entry script isn't on disk.
+    """
+    if not config.args or not Path(config.args[0]).is_file():
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    h.update(fast_json.dumps([config.command, config.args, sorted(config.env.items())]).encode())
+    for path in sorted(Path(config.args[0]).parent.rglob("*.js")):
+        h.update(f"{path}:{path.stat().st_mtime_ns}".encode())
+    if DEFAULTS_PATH.exists():
+        h.update(str(DEFAULTS_PATH.stat().st_mtime_ns).encode())
+    return h.hexdigest()
+
+
+def _catalog_path(config: MCPServerConfig) -> Path:
+    return CACHE_DIR / f"mcp-tools-{config.name}.json"
+
+
+def _read_catalog(config: MCPServerConfig, key: str) -> Optional[list[dict[str, Any]]]:
+    try:
+        cached = fast_json.loads(_catalog_path(config).read_bytes())
+    except (OSError, ValueError):
+        return None
+    return cached["tools"] if cached.get("key") == key else None
+
+
+def _write_catalog(config: MCPServerConfig, key: str, tools: list[dict[str, Any]]) -> None:
+    """Atomic write (tmp + rename) so concurrent CLI runs never see half a file."""
+    path = _catalog_path(config)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(fast_json.dumps({"key": key, "tools": tools}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug("Could not cache tool list for %s: %s", config.name, exc)
 
 
 class MCPClientManager:
     """Manages connections to multiple MCP servers."""
 
-    def __init__(self, servers: Optional[list[MCPServerConfig]] = None):
+    def __init__(self, servers: Optional[list[MCPServerConfig]] = None, memoize: bool = True):
         self.server_configs = servers or _load_server_configs()
         self.connected_servers: dict[str, ConnectedServer] = {}
         self._tool_to_server: dict[str, str] = {}
         self._claude_tools: list[dict[str, Any]] = []
-        self._contexts: list[Any] = []
+        self._session_tasks: list[asyncio.Task] = []
+        self._start_tasks: dict[str, asyncio.Task] = {}
+        self._closing = asyncio.Event()
+
+        cfg = load_agent_config()
+        self._read_only_tools = frozenset(cfg.read_only_tools)
+        self._call_memo_ttl = cfg.tool_result_ttl_seconds if memoize else 0
+        self._call_memo: dict[str, tuple[float, str]] = {}  # key → (monotonic time, result)
+
+    async def connect_all(self, lazy: bool = False) -> list[dict[str, Any]]:
+        """
+        Connect to all configured MCP servers concurrently and discover tools.
 
-    async def connect_all(self) -> list[dict[str, Any]]:
-        """Connect to all configured MCP servers and discover tools."""
-        all_tools: list[dict[str, Any]] = []
+        lazy=True registers servers with a cached tool list without starting
+        them; each is started on its first call_tool() (or by start_pending()).
+        """
+        cached: dict[str, list[dict[str, Any]]] = {}
+        if lazy:
+            for config in self.server_configs:
+                key = _catalog_key(config)
+                tools = _read_catalog(config, key) if key else None
+                if tools is not None:
+                    cached[config.name] = tools
+
+        started = iter(await asyncio.gather(
+            *(self._connect_server(c) for c in self.server_configs if c.name not in cached),
+            return_exceptions=True,
+        ))
+        # Register in config order, not completion order, so the tool list is stable
+        registered: list[ConnectedServer] = []
         for config in self.server_configs:
-            try:
-                tools = await self._connect_server(config)
-                all_tools.extend(tools)
-                logger.info("Connected to %s: %d tools", config.name, len(tools))
-            except Exception as exc:
-                logger.warning("Failed to connect to %s: %s", config.name, exc)
+            if config.name in cached:
+                result = ConnectedServer(config=config, tools=cached[config.name])
+            else:
+                result = next(started)
+            if isinstance(result, BaseException):
+                logger.warning("Failed to connect to %s: %s", config.name, result)
+                continue
+            self.connected_servers[config.name] = result
+            registered.append(result)
+            logger.info(
+                "%s %s: %d tools",
+                "Connected to" if result.session else "Registered (lazy)", config.name, len(result.tools),
+            )
+
+        # Routing table built in one pass once every server has reported in
+        self._tool_to_server.update({t["name"]: s.config.name for s in registered for t in s.tools})
+        all_tools = [t for s in registered for t in s.tools]
 
+        # Fixed (server, tool) order — the serialized tool list is part of the
+        # prompt-cache prefix, so it must not depend on startup timing
+        all_tools.sort(key=lambda t: (self._tool_to_server[t["name"]], t["name"]))
         self._claude_tools = all_tools
         return all_tools
 
-    async def _connect_server(self, config: MCPServerConfig) -> list[dict[str, Any]]:
+    async def start_pending(self) -> None:
+        """Start every lazily registered server now. Servers that fail are dropped."""
+        pending = [name for name, server in self.connected_servers.items() if server.session is None]
+        results = await asyncio.gather(*(self._ensure_started(n) for n in pending), return_exceptions=True)
+        failed = set()
+        for name, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to connect to %s: %s", name, result)
+                failed.add(name)
+                del self.connected_servers[name]
+        if failed:
+            self._claude_tools[:] = [
+                t for t in self._claude_tools if self._tool_to_server.get(t["name"]) not in failed
+            ]
+            self._tool_to_server = {t: s for t, s in self._tool_to_server.items() if s not in failed}
+
+    async def _ensure_started(self, server_name: str) -> ConnectedServer:
+        """
+        Start a lazily registered server once, however many calls race for it.
+
+        The start runs in its own task, shielded from the callers: a caller
+        cancelled mid-start (a wait_for timeout, Ctrl-C) doesn't abandon a
+        half-started server for the next call to start a second copy of.
+        A start that failed is retried by the next call.
+        """
+        server = self.connected_servers[server_name]
+        if server.session is None:
+            task = self._start_tasks.get(server_name)
+            if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+                task = asyncio.create_task(self._start(server), name=f"mcp-start:{server_name}")
+                self._start_tasks[server_name] = task
+            await asyncio.shield(task)
+        return server
+
+    async def _start(self, server: ConnectedServer) -> None:
+        server.session = (await self._connect_server(server.config)).session
+
+    async def _connect_server(self, config: MCPServerConfig) -> ConnectedServer:
+        ready: asyncio.Future[ConnectedServer] = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._hold_session(config, ready), name=f"mcp:{config.name}")
+        self._session_tasks.append(task)
+        return await ready
+
+    async def _hold_session(self, config: MCPServerConfig, ready: asyncio.Future) -> None:
+        """Open the session, publish it via `ready`, and keep it open until disconnect_all()."""
         server_params = StdioServerParameters(
             command=config.command,
-            args=config.args,
-            env=dict(config.env) if config.env else None,
+            args=list(config.args),
+            env=config.env or None,  # pydantic validation copies it
         )
+        try:
+            async with stdio_client(server_params) as (read_stream, write_stream), \
+                    ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
 
-        ctx = stdio_client(server_params)
-        read_stream, write_stream = await ctx.__aenter__()
-        self._contexts.append(ctx)
-
-        session = ClientSession(read_stream, write_stream)
-        await session.__aenter__()
-        self._contexts.append(session)
-        await session.initialize()
-
-        tools_response = await session.list_tools()
-        claude_tools = []
-        for tool in tools_response.tools:
-            claude_tool = {
-                "name": tool.name,
-                "description": tool.description or "",
-                "input_schema": tool.inputSchema,
-            }
-            claude_tools.append(claude_tool)
-            self._tool_to_server[tool.name] = config.name
-
-        self.connected_servers[config.name] = ConnectedServer(
-            config=config,
-            session=session,
-            tools=claude_tools,
-        )
-        return claude_tools
+                catalog_key = _catalog_key(config)
+                claude_tools = _read_catalog(config, catalog_key) if catalog_key else None
+                if claude_tools is None:
+                    tools_response = await session.list_tools()
+                    claude_tools = [
+                        {"name": t.name, "description": t.description or "", "input_schema": t.inputSchema}
+                        for t in tools_response.tools
+                    ]
+                    if catalog_key:
+                        _write_catalog(config, catalog_key, claude_tools)
+
+                ready.set_result(ConnectedServer(config=config, tools=claude_tools, session=session))
+                await self._closing.wait()
+        except Exception as exc:
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                logger.debug("MCP server %s closed with error: %s", config.name, exc)
+        finally:
+            if not ready.done():
+                ready.cancel()
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Route a tool call to the correct MCP server and return the result string."""
         server_name = self._tool_to_server.get(tool_name)
         if not server_name:
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
+            return fast_json.dumps({"error": f"Unknown tool: {tool_name}"})
 
         server = self.connected_servers.get(server_name)
         if not server:
-            return json.dumps({"error": f"Server '{server_name}' not connected"})
+            return fast_json.dumps({"error": f"Server '{server_name}' not connected"})
+
+        memo_key = None
+        if tool_name in self._read_only_tools and self._call_memo_ttl > 0:
+            memo_key = f"{tool_name}|{fast_json.dumps(arguments, sort_keys=True)}"
+            hit = self._call_memo.get(memo_key)
+            if hit and time.monotonic() - hit[0] < self._call_memo_ttl:
+                return hit[1]
+        else:
+            # Any other tool may have written what a read-only one reads (e.g. save_baseline)
+            self._call_memo.clear()
 
         try:
-            result = await server.session.call_tool(tool_name, arguments)
-            parts = [
-                content.text if hasattr(content, "text") else str(content)
-                for content in result.content
-            ]
-            return "\n".join(parts)
+            if server.session is None:
+                server = await self._ensure_started(server_name)
+            async with server.sem:
+                result = await server.session.call_tool(tool_name, arguments)
+            blocks = result.content
+            # Our servers answer with one text block — skip the join for that case
+            if len(blocks) == 1 and type(blocks[0]) is TextContent:
+                text = blocks[0].text
+            else:
+                text = "\n".join([b.text if type(b) is TextContent else str(b) for b in blocks])
         except Exception as exc:
-            return json.dumps({"error": f"Tool call failed: {exc}"})
+            return fast_json.dumps({"error": f"Tool call failed: {exc}"})
+
+        if memo_key and not result.isError:
+            if len(self._call_memo) >= _CALL_MEMO_MAX_ENTRIES:
+                del self._call_memo[next(iter(self._call_memo))]
+            self._call_memo[memo_key] = (time.monotonic(), text)
+        return text
 
     def get_claude_tools(self) -> list[dict[str, Any]]:
         """All discovered tools in Claude API format."""
@@ -175,20 +359,20 @@ class MCPClientManager:
     def get_tool_summary(self) -> str:
         """Human-readable summary of connected servers and their tools."""
         lines = ["Connected MCP Servers:"]
-        for name, server in self.connected_servers.items():
-            tool_names = [t["name"] for t in server.tools]
-            lines.append(f"  {name}: {', '.join(tool_names)}")
+        lines.extend(
+            f"  {name}: {', '.join([t['name'] for t in server.tools])}"
+            for name, server in self.connected_servers.items()
+        )
         lines.append(f"\nTotal: {len(self._claude_tools)} tools available")
         return "\n".join(lines)
 
     async def disconnect_all(self) -> None:
-        """Disconnect from all MCP servers and clean up contexts."""
-        for ctx in reversed(self._contexts):
-            try:
-                await ctx.__aexit__(None, None, None)
-            except Exception:
-                pass
-        self._contexts.clear()
+        """Disconnect from all MCP servers concurrently and clean up sessions."""
+        self._closing.set()
+        await asyncio.gather(*self._session_tasks, *self._start_tasks.values(), return_exceptions=True)
+        self._session_tasks.clear()
+        self._start_tasks.clear()
+        self._closing = asyncio.Event()
         self.connected_servers.clear()
         self._tool_to_server.clear()
         self._claude_tools.clear()
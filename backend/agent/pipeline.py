@@ -1,7 +1,7 @@
 """
 Deterministic 6-step performance test pipeline.
 
-Steps (always run in this order):
+Steps:
   1. discover_endpoints       — fetch live Swagger spec, apply filters
   2. generate_k6_script       — write test-scripts/<service>-deterministic.js
   3. snapshot_metrics (before) — capture server state before load
@@ -9,25 +9,27 @@ Steps (always run in this order):
   5. snapshot_metrics (after)  — capture server state after load
   6. analyze + compare + report
 
+Independent steps overlap: 2 ∥ 3, and 5 ∥ analyze/compare/save-baseline.
+The report is generated last, once both snapshots are available.
+
 No AI involved — same inputs always produce the same tool call sequence.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Optional, TYPE_CHECKING
-
-from rich.console import Console
+from typing import Any, Awaitable, Optional, TYPE_CHECKING
 
 from .config_loader import TestRunConfig
+from .console import console
 from .tool_caller import call_tool_safe, take_snapshot, ToolCallError
 
 if TYPE_CHECKING:
     from .mcp_client import MCPClientManager
 
 logger = logging.getLogger(__name__)
-console = Console()
 
 
 @dataclass
@@ -50,14 +52,19 @@ class DeterministicPipeline:
     def __init__(self, mcp: "MCPClientManager", config: TestRunConfig):
         self.mcp = mcp
         self.config = config
+        self._quiet = config.ci  # CI prints only the final verdict
 
     # ── Console helpers ───────────────────────────────────────────────────────
+    # Call sites that format a message guard on self._quiet themselves, so CI
+    # runs skip building the string as well as printing it.
 
     def _log(self, msg: str) -> None:
-        if not self.config.ci:
+        if not self._quiet:
             console.print(msg)
 
     def _step(self, n: int, total: int, label: str) -> None:
+        if self._quiet:
+            return
         self._log(f"\n[bold cyan][{n}/{total}][/bold cyan] {label}")
 
     def _ok(self, msg: str) -> None:
@@ -120,38 +127,29 @@ class DeterministicPipeline:
         )
         return {"test_name": test_name, "script_name": result.get("script_name")}
 
-    async def _analyze(
-        self,
-        results_file: str,
-        snap_before: Optional[str],
-        snap_after: Optional[str],
-    ) -> tuple[dict, Optional[dict], dict, str]:
+    async def _evaluate(self, results_file: str) -> tuple[dict, Optional[dict], str]:
+        """Grade the run and compare against the baseline concurrently, then save the baseline."""
         cfg = self.config
 
-        analysis = await call_tool_safe(
+        calls = [call_tool_safe(
             self.mcp, "analyze_results",
             {"results_file": results_file},
             verbose=cfg.verbose,
-        )
-        self._ok(f"Grade: {analysis.get('performance_grade', '?')}")
-        verdict = "PASS"
-
+        )]
         # Optional: compare against baseline
-        comparison = None
         if cfg.baseline:
-            comparison = await call_tool_safe(
+            calls.append(call_tool_safe(
                 self.mcp, "compare_baseline",
                 {"current_results_file": results_file, "baseline_name": cfg.baseline},
                 verbose=cfg.verbose,
-            )
-            verdict = comparison.get("verdict", "PASS")
-            regressions = comparison.get("regressions", [])
-            if regressions:
-                self._log(f"  [red]✗[/red]  Regressions: {', '.join(regressions)}")
-            else:
-                self._ok(f"No regressions vs '{cfg.baseline}'")
-
-        # Optional: save as new baseline
+            ))
+        results = await _concurrently(*calls)
+        analysis = results[0]
+        comparison = results[1] if cfg.baseline else None
+
+        # Optional: save as new baseline — only once the results have been
+        # analyzed (and compared) successfully, so a failed run never
+        # overwrites a good baseline
         if cfg.save_as:
             await call_tool_safe(
                 self.mcp, "save_baseline",
@@ -162,9 +160,17 @@ class DeterministicPipeline:
                 },
                 verbose=cfg.verbose,
             )
-            self._ok(f"Saved as baseline '{cfg.save_as}'")
+        verdict = comparison.get("verdict", "PASS") if comparison else "PASS"
+        return analysis, comparison, verdict
 
-        # Generate Markdown report
+    async def _report(
+        self,
+        results_file: str,
+        snap_before: Optional[str],
+        snap_after: Optional[str],
+    ) -> dict:
+        """Generate the Markdown report."""
+        cfg = self.config
         report_args: dict = {
             "results_file": results_file,
             "service_name": cfg.service,
@@ -176,10 +182,22 @@ class DeterministicPipeline:
         if snapshot_paths:
             report_args["metrics_snapshots"] = snapshot_paths
 
-        report = await call_tool_safe(
+        return await call_tool_safe(
             self.mcp, "generate_report", report_args, verbose=cfg.verbose
         )
-        return analysis, comparison, report, verdict
+
+    def _log_evaluation(self, snap_after: Optional[str], analysis: dict, comparison: Optional[dict]) -> None:
+        cfg = self.config
+        self._ok("Metrics captured") if snap_after else self._warn("No metrics endpoint — skipping")
+        self._ok(f"Grade: {analysis.get('performance_grade', '?')}")
+        if comparison:
+            regressions = comparison.get("regressions", [])
+            if regressions:
+                self._log(f"  [red]✗[/red]  Regressions: {', '.join(regressions)}")
+            else:
+                self._ok(f"No regressions vs '{cfg.baseline}'")
+        if cfg.save_as:
+            self._ok(f"Saved as baseline '{cfg.save_as}'")
 
     # ── Main entry point ──────────────────────────────────────────────────────
 
@@ -188,19 +206,20 @@ class DeterministicPipeline:
 
         self._step(1, 6, "Discovering endpoints...")
         discovery = await self._discover()
-        self._ok(
-            f"{len(discovery['endpoints'])} endpoint(s) | "
-            f"{discovery['eff_users']} users | {discovery['eff_duration']}s"
-        )
+        if not self._quiet:
+            self._ok(
+                f"{len(discovery['endpoints'])} endpoint(s) | "
+                f"{discovery['eff_users']} users | {discovery['eff_duration']}s"
+            )
 
+        # Steps 2 and 3 are independent — run them concurrently
         self._step(2, 6, "Generating k6 script...")
-        script = await self._generate_script(discovery)
-        self._ok(script["script_name"])
-
         self._step(3, 6, "Capturing pre-test metrics...")
-        snap_before = await take_snapshot(
-            self.mcp, discovery["base_url"], cfg.service, "before", cfg.verbose
+        script, snap_before = await _concurrently(
+            self._generate_script(discovery),
+            take_snapshot(self.mcp, discovery["base_url"], cfg.service, "before", cfg.verbose),
         )
+        self._ok(script["script_name"])
         self._ok("Metrics captured") if snap_before else self._warn("No metrics endpoint — skipping")
 
         self._step(4, 6, "Running load test...")
@@ -209,19 +228,21 @@ class DeterministicPipeline:
             {"script_name": f"{script['test_name']}.js"},
             verbose=cfg.verbose,
         )
-        self._ok(f"Status: {run_result.get('status')}")
+        if not self._quiet:
+            self._ok(f"Status: {run_result.get('status')}")
         results_file = run_result.get("results_file", "")
 
+        # Step 5 and the grading half of step 6 only need results_file
         self._step(5, 6, "Capturing post-test metrics...")
-        snap_after = await take_snapshot(
-            self.mcp, discovery["base_url"], cfg.service, "after", cfg.verbose
-        )
-        self._ok("Metrics captured") if snap_after else self._warn("No metrics endpoint — skipping")
-
         self._step(6, 6, "Analyzing results...")
-        analysis, comparison, report, verdict = await self._analyze(
-            results_file, snap_before, snap_after
+        snap_after, (analysis, comparison, verdict) = await _concurrently(
+            take_snapshot(self.mcp, discovery["base_url"], cfg.service, "after", cfg.verbose),
+            self._evaluate(results_file),
         )
+        if not self._quiet:
+            self._log_evaluation(snap_after, analysis, comparison)
+
+        report = await self._report(results_file, snap_before, snap_after)
 
         return PipelineResult(
             analysis=analysis,
@@ -229,3 +250,20 @@ class DeterministicPipeline:
             report=report,
             verdict=verdict,
         )
+
+
+async def _concurrently(*coros: Awaitable[Any]) -> list[Any]:
+    """
+    Await coroutines concurrently in a TaskGroup; results come back in order.
+
+    If one fails the others are cancelled and the first error is re-raised
+    unwrapped, so callers still see ToolCallError / ValueError rather than
+    an ExceptionGroup. take_snapshot never raises, so a failed snapshot
+    can't abort its sibling step.
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(c) for c in coros]
+    except* Exception as group:
+        raise group.exceptions[0] from None
+    return [t.result() for t in tasks]
@@ -3,8 +3,16 @@ System prompts for the performance testing agent.
 
 Prompt text lives in agent/prompts/*.txt — edit there, not here.
 This file is a thin loader; it owns no prompt content.
+
+Provides:
+  - system_prompt()   — the main system prompt
+  - ci_mode_prompt()  — extra instructions appended in CI mode
+
+Each file is read on first use and kept for the life of the process, so
+non-CI runs never read the CI prompt.
 """
 
+import functools
 from pathlib import Path
 
 _PROMPTS_DIR = Path(__file__).parent / "prompts"
@@ -14,5 +22,11 @@ def _load(filename: str) -> str:
     return (_PROMPTS_DIR / filename).read_text(encoding="utf-8").strip()
 
 
-SYSTEM_PROMPT = _load("system_prompt.txt")
-CI_MODE_PROMPT = _load("ci_mode_prompt.txt")
+@functools.lru_cache(maxsize=1)
+def system_prompt() -> str:
+    return _load("system_prompt.txt")
+
+
+@functools.lru_cache(maxsize=1)
+def ci_mode_prompt() -> str:
+    return _load("ci_mode_prompt.txt")
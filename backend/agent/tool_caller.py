@@ -8,29 +8,50 @@ Provides:
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional, Protocol
 
-from rich.console import Console
+from . import fast_json
+from .config_loader import load_agent_config
+from .console import console
 
 if TYPE_CHECKING:
-    from .mcp_client import MCPClientManager
+    from rich.text import Text
 
 logger = logging.getLogger(__name__)
-console = Console()
+
+# Responses at least this long are parsed in a worker thread, so one big
+# payload doesn't stall concurrent pipeline steps on the event loop
+_THREAD_PARSE_MIN_CHARS = 128 * 1024
+
+
+class ToolClient(Protocol):
+    """What these helpers need from an MCP client — MCPClientManager and DaemonClient both fit."""
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> str: ...
 
 
 class ToolCallError(Exception):
     """Raised when an MCP tool returns an error response."""
 
-    def __init__(self, tool_name: str, message: str):
+    # Slots keep BaseException's lazily created __dict__ from ever being allocated
+    __slots__ = ("tool_name", "raw_message")
+
+    def __init__(self, tool_name: str, message: Any):
+        super().__init__(tool_name, message)
         self.tool_name = tool_name
-        super().__init__(f"[{tool_name}] {message}")
+        self.raw_message = message
+
+    def __str__(self) -> str:
+        # Formatted on demand — take_snapshot swallows most of these unprinted
+        return f"[{self.tool_name}] {self.raw_message}"
 
 
 async def call_tool_safe(
-    mcp: "MCPClientManager",
+    mcp: ToolClient,
     name: str,
     args: dict,
     verbose: bool = False,
@@ -47,14 +68,17 @@ async def call_tool_safe(
     if verbose:
         _log_tool(name, args, raw)
 
-    result = json.loads(raw)
+    if len(raw) >= _THREAD_PARSE_MIN_CHARS:
+        result = await asyncio.to_thread(fast_json.loads, raw)
+    else:
+        result = fast_json.loads(raw)
     if "error" in result:
-        raise ToolCallError(name, str(result["error"]))
+        raise ToolCallError(name, result["error"])
     return result
 
 
 async def take_snapshot(
-    mcp: "MCPClientManager",
+    mcp: ToolClient,
     base_url: str,
     service: str,
     label: str,
@@ -63,24 +87,63 @@ async def take_snapshot(
     """
     Take a before/after metrics snapshot.
 
-    Returns the saved file path, or None if the endpoint is unavailable.
+    Returns the saved file path, or None if the endpoint is unavailable or
+    doesn't answer within agent.snapshot_timeout_seconds.
     Never raises — snapshot failure must not abort the pipeline.
     """
     try:
-        result = await call_tool_safe(
-            mcp,
-            "snapshot_metrics",
-            {"base_url": base_url, "label": label, "service_name": service},
-            verbose=verbose,
+        result = await asyncio.wait_for(
+            call_tool_safe(
+                mcp,
+                "snapshot_metrics",
+                {"base_url": base_url, "label": label, "service_name": service},
+                verbose=verbose,
+            ),
+            load_agent_config().snapshot_timeout_seconds or None,
         )
         return result.get("saved_to")
-    except (ToolCallError, json.JSONDecodeError) as exc:
-        logger.debug("Snapshot skipped (%s): %s", label, exc)
+    except (ToolCallError, json.JSONDecodeError, TimeoutError) as exc:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Snapshot skipped (%s): %s", label, exc)
         return None
 
 
+@functools.lru_cache(maxsize=1)
+def _log_prefixes() -> tuple["Text", "Text", "Text"]:
+    """
+    Pre-styled prefixes, built on first verbose call. Tool names, args and
+    results are appended as plain Text, so Rich never scans them for markup.
+    """
+    from rich.text import Text  # noqa: PLC0415
+    return (
+        Text("    → tool: ", style="dim"),
+        Text("    → args: ", style="dim"),
+        Text("    → result: ", style="dim"),
+    )
+
+
+# Verbose previews are cut to this many characters
+_ARGS_PREVIEW_CHARS = 400
+_RESULT_PREVIEW_CHARS = 600
+
+
 def _log_tool(tool_name: str, args: dict, raw_result: str) -> None:
-    console.print(f"    [dim]→ tool:[/dim] [bold]{tool_name}[/bold]")
-    console.print(f"    [dim]→ args:[/dim] {json.dumps(args, indent=6)[:400]}")
-    preview = raw_result[:600] + "..." if len(raw_result) > 600 else raw_result
-    console.print(f"    [dim]→ result:[/dim] {preview}")
+    """Verbose-only. Callers check the flag, so quiet runs never build these previews."""
+    from rich.text import Text  # noqa: PLC0415
+
+    tool_prefix, args_prefix, result_prefix = _log_prefixes()
+    preview = (
+        raw_result[:_RESULT_PREVIEW_CHARS] + "..." if len(raw_result) > _RESULT_PREVIEW_CHARS else raw_result
+    )
+    # Indent only args that will mostly fit — big ones (e.g. a full endpoint
+    # list) would be pretty-printed just to be cut off
+    args_text = fast_json.dumps(args)
+    if len(args_text) <= _ARGS_PREVIEW_CHARS:
+        args_text = fast_json.pretty(args)
+    # One print call: one render pass and one write for all three lines
+    console.print(
+        tool_prefix + Text(tool_name, style="bold"),
+        args_prefix + args_text[:_ARGS_PREVIEW_CHARS],
+        result_prefix + preview,
+        sep="\n",
+    )
@@ -44,9 +44,7 @@ export async function handleRunTest(args: unknown): Promise<ToolResult> {
                 ? { k6_stderr_preview: result.k6_stderr_preview }
                 : {}),
               // GUARDRAIL: Only aggregate stats returned. Raw logs stay in results/ locally.
-            },
-            null,
-            2
+            }
           ),
         },
       ],
@@ -6,7 +6,7 @@ import {
   CallToolRequestSchema,
   ListToolsRequestSchema,
 } from "@modelcontextprotocol/sdk/types.js";
-import { readFileSync, writeFileSync, existsSync, mkdirSync, readdirSync } from "fs";
+import { readFileSync, writeFileSync, existsSync, mkdirSync, readdirSync, statSync } from "fs";
 import { resolve, dirname } from "path";
 import { fileURLToPath } from "url";
 import { parse } from "yaml";
@@ -83,9 +83,24 @@ const server = new Server(
 
 // --- Helper Functions ---
 
+// One pipeline run hands the same results file to analyze_results,
+// compare_baseline, save_baseline and generate_report — parse it once.
+// Keyed on mtime + size so a rewritten file is re-read. Callers must not mutate.
+let lastResults: { path: string; mtimeMs: number; size: number; data: any } | null = null;
+
 function loadK6Results(filePath: string): any {
-  const raw = readFileSync(filePath, "utf-8");
-  return JSON.parse(raw);
+  const { mtimeMs, size } = statSync(filePath);
+  if (
+    lastResults &&
+    lastResults.path === filePath &&
+    lastResults.mtimeMs === mtimeMs &&
+    lastResults.size === size
+  ) {
+    return lastResults.data;
+  }
+  const data = JSON.parse(readFileSync(filePath, "utf-8"));
+  lastResults = { path: filePath, mtimeMs, size, data };
+  return data;
 }
 
 function extractAggregateStats(data: any): Record<string, any> {
@@ -322,9 +337,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
                   aggregate_stats: stats,
                   performance_grade: grade,
                   notes,
-                },
-                null,
-                2
+                }
               ),
             },
           ],
@@ -435,9 +448,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
                   regressions,
                   improvements,
                   verdict: hasRegression ? "REGRESSION_DETECTED" : "PASS",
-                },
-                null,
-                2
+                }
               ),
             },
           ],
@@ -480,9 +491,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
                   baseline_name: baselineName,
                   saved_to: baselinePath,
                   aggregate_stats: stats,
-                },
-                null,
-                2
+                }
               ),
             },
           ],
@@ -610,9 +619,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
                   saved_to: reportPath,
                   grade,
                   notes,
-                },
-                null,
-                2
+                }
               ),
             },
           ],
@@ -18,6 +18,7 @@ export async function fetchSwagger(
   try {
     const response = await fetch(url, { signal: controller.signal });
     if (!response.ok) {
+      response.body?.cancel().catch(() => {}); // let the keep-alive connection be reused
       throw new Error(`HTTP ${response.status}: ${response.statusText}`);
     }
     return await response.json();
@@ -45,15 +45,28 @@ async function fetchWithTimeout(url: string, timeoutMs = 5000): Promise<Response
   }
 }
 
+// Node's fetch keeps connections alive in a shared pool for the life of this
+// server process, but a connection only returns to the pool once its body
+// has been read — drain the ones we don't read.
+function release(res: Response): void {
+  res.body?.cancel().catch(() => {});
+}
+
 async function fetchJson(url: string, timeoutMs = 5000): Promise<any> {
   const res = await fetchWithTimeout(url, timeoutMs);
-  if (!res.ok) throw new Error(`HTTP ${res.status}: ${res.statusText}`);
+  if (!res.ok) {
+    release(res);
+    throw new Error(`HTTP ${res.status}: ${res.statusText}`);
+  }
   return await res.json();
 }
 
 async function fetchText(url: string, timeoutMs = 5000): Promise<string> {
   const res = await fetchWithTimeout(url, timeoutMs);
-  if (!res.ok) throw new Error(`HTTP ${res.status}: ${res.statusText}`);
+  if (!res.ok) {
+    release(res);
+    throw new Error(`HTTP ${res.status}: ${res.statusText}`);
+  }
   return await res.text();
 }
 
@@ -65,6 +78,7 @@ async function detectMetricsSource(baseUrl: string): Promise<MetricsSource> {
   // Try Spring Actuator first
   try {
     const res = await fetchWithTimeout(`${baseUrl}/actuator/health`, 3000);
+    release(res);
     if (res.ok) return "spring_actuator";
   } catch {}
 
@@ -77,6 +91,8 @@ async function detectMetricsSource(baseUrl: string): Promise<MetricsSource> {
       if (text.includes("# HELP") || text.includes("# TYPE") || /^\w+[\s{]/m.test(text)) {
         return "prometheus";
       }
+    } else {
+      release(res);
     }
   } catch {}
 
@@ -106,6 +122,7 @@ async function checkHealthMultiPath(baseUrl: string): Promise<{ path: string; st
           details,
         };
       }
+      release(res);
     } catch {}
   }
   return { path: "none", status: "UNREACHABLE", details: {} };